@@ -1,8 +1,17 @@
 import streamlit as st
-from openai import OpenAI
+from openai import AsyncOpenAI
+import httpx
+import asyncio
+import json
+import queue
+import threading
 import time
 import os
 from dotenv import load_dotenv
+from prompts import (
+    MODEL, MAX_TOKENS, TEMPERATURES, BUGGY_SYSTEM_PROMPT, IMPROVED_SYSTEM_PROMPT, CHALLENGE_INPUTS,
+    WARM_RESPONSES_PATH,
+)
 load_dotenv(override=True)
 
 # Page config
@@ -33,171 +42,333 @@ with st.expander("ℹ️ How This Demo Works"):
     Each agent has a 10-message limit to demonstrate debugging principles. 
     """)
 
-# Initialize OpenAI client
+# Initialize OpenAI client once per process so the HTTP connection pool survives reruns.
+# HTTP/2 lets both agents' streams share a single multiplexed connection.
+@st.cache_resource
+def get_client():
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=60.0),
+    )
+    return AsyncOpenAI(api_key=os.environ["OPENAI_API_KEY"], http_client=http_client)
+
+# A single long-lived event loop owns the client's connections; Streamlit reruns hand it work
+@st.cache_resource
+def get_event_loop():
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
 try:
-    # Initialize OpenAI client
-    client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+    client = get_client()
 except Exception as e:
     st.error("❌ OpenAI API key not found. Please configure your secrets.")
     st.stop()
 
-# System prompts for each agent
-BUGGY_SYSTEM_PROMPT = """You are a resume helper. Help with resumes."""
+# Number of most recent chat messages sent to the API alongside the system prompt
+HISTORY_WINDOW = 6
 
-IMPROVED_SYSTEM_PROMPT = """You are a helpful and professional Resume Helper AI. Your role is to assist users with resume-related tasks.
+# How long a live reply to a first-turn challenge input is reused, in seconds
+REPLY_CACHE_TTL = 3600
 
-IMPORTANT GUIDELINES:
-1. If a user's request is confusing, unclear, or nonsensical, politely acknowledge the confusion and ask for clarification
-2. If a user gives a vague request like "make it better", ask them to be more specific about what they want to improve
-3. If a user asks about impossible or unrealistic career goals, be helpful but redirect them to realistic alternatives
-4. If a user sends an empty or very short message, provide helpful examples of what you can assist with
-5. Always maintain a friendly, professional tone even when handling unusual requests
-6. Provide specific examples and actionable advice when possible
-
-Remember: It's better to ask for clarification than to make assumptions about what the user wants."""
+# Streamed text is redrawn once this many chunks or seconds have built up, rather than per token
+FLUSH_CHUNKS = 20
+FLUSH_INTERVAL = 0.05
 
 # Challenge buttons
 st.markdown("### 🎯 Quick Challenge Inputs:")
 col1, col2, col3, col4, col5 = st.columns(5)
 
-challenge_inputs = [
-    "Help me with my purple resume that tastes like Tuesday",
-    "Make it better", 
-    "HELP ME NOW URGENT!!!",
-    "Can you help me become a unicorn trainer?",
-    ""  # Empty message
-]
-
-if col1.button("🟣 Nonsensical", help=challenge_inputs[0]):
-    st.session_state.auto_send_message = challenge_inputs[0]
-if col2.button("❓ Vague", help=challenge_inputs[1]):
-    st.session_state.auto_send_message = challenge_inputs[1]
-if col3.button("😱 Panic", help=challenge_inputs[2]):
-    st.session_state.auto_send_message = challenge_inputs[2]
-if col4.button("🦄 Impossible", help=challenge_inputs[3]):
-    st.session_state.auto_send_message = challenge_inputs[3]
+# Messages queued for each agent; a challenge button fills both, and each agent pops its own
+if 'pending_prompts' not in st.session_state:
+    st.session_state.pending_prompts = {}
+
+auto_send_message = None
+if col1.button("🟣 Nonsensical", help=CHALLENGE_INPUTS[0]):
+    auto_send_message = CHALLENGE_INPUTS[0]
+if col2.button("❓ Vague", help=CHALLENGE_INPUTS[1]):
+    auto_send_message = CHALLENGE_INPUTS[1]
+if col3.button("😱 Panic", help=CHALLENGE_INPUTS[2]):
+    auto_send_message = CHALLENGE_INPUTS[2]
+if col4.button("🦄 Impossible", help=CHALLENGE_INPUTS[3]):
+    auto_send_message = CHALLENGE_INPUTS[3]
 if col5.button("⭕ Empty Message", help="Send an empty message"):
-    st.session_state.auto_send_message = challenge_inputs[4]
+    auto_send_message = CHALLENGE_INPUTS[4]
 
-# Show which message will be sent and trigger rerun
-if 'auto_send_message' in st.session_state and 'showing_auto_message' not in st.session_state:
-    st.info(f"🚀 **Sending to both agents:** '{st.session_state.auto_send_message}'" if st.session_state.auto_send_message else "🚀 **Sending empty message to both agents**")
-    st.markdown("*This message will be automatically sent to both agents for comparison*")
-    st.session_state.showing_auto_message = True
-    time.sleep(0.1)  # Brief pause for user to see the message
-    st.rerun()
+# Queue the message for both agents; each shows it and picks it up later in this same run
+if auto_send_message is not None:
+    st.session_state.pending_prompts = {'buggy': auto_send_message, 'improved': auto_send_message}
 
 # Create two columns for side-by-side chat
 left_col, right_col = st.columns(2)
 
 # Initialize session state for both agents
+# Chat history is kept as parallel tuples of roles and contents, replaced as a whole on each append
 for agent in ['buggy', 'improved']:
-    if f"{agent}_messages" not in st.session_state:
-        st.session_state[f"{agent}_messages"] = []
+    if f"{agent}_roles" not in st.session_state:
+        st.session_state[f"{agent}_roles"] = ()
+        st.session_state[f"{agent}_contents"] = ()
     if f"{agent}_max_messages" not in st.session_state:
         st.session_state[f"{agent}_max_messages"] = 20  # 10 rounds of conversation
 
-def create_chat_interface(agent_type, system_prompt, column):
-    """Create a chat interface for one agent"""
+def append_message(agent_type, role, content):
+    """Append one message to an agent's chat history"""
+    st.session_state[f"{agent_type}_roles"] = (*st.session_state[f"{agent_type}_roles"], role)
+    st.session_state[f"{agent_type}_contents"] = (*st.session_state[f"{agent_type}_contents"], content)
+
+def show_message_count(stats, agent_type):
+    """Show an agent's message count in its stats placeholder, or nothing for an empty chat"""
+    count = len(st.session_state[f"{agent_type}_roles"])
+    if count:
+        stats.metric(f"📊 {agent_type.title()} Agent Messages", count, delta=None)
+    else:
+        stats.empty()
+
+def make_agent_ui(agent_type, system_prompt, temperature, max_tokens, header, caption):
+    """Build the chat interface for one agent, with its settings and state keys bound up front"""
+    roles_key = f"{agent_type}_roles"
+    contents_key = f"{agent_type}_contents"
+    max_messages_key = f"{agent_type}_max_messages"
+    input_placeholder = f"Try to break the {agent_type} agent!"
+    input_key = f"{agent_type}_input"
+    clear_label = f"🗑️ Clear {agent_type.title()} Chat"
+    clear_key = f"clear_{agent_type}"
     
-    with column:
+    @st.fragment
+    def _run(pending_prompts):
+        """Render the chat interface and return its pending API request, if any"""
+        pending = None
+        
         # Agent header
-        if agent_type == 'buggy':
-            st.markdown("### 🐛 Buggy Agent (Before Debugging)")
-            st.markdown("*Poorly designed with weak prompting*")
-        else:
-            st.markdown("### ✅ Improved Agent (After Debugging)")  
-            st.markdown("*Properly debugged with error handling*")
+        st.markdown(header)
+        st.markdown(caption)
         
-        # Display chat messages
-        messages_key = f"{agent_type}_messages"
-        max_messages_key = f"{agent_type}_max_messages"
+        # Take any auto-sent message for this agent (dropped if the agent is at its limit).
+        # pending_prompts is the session's shared dict, so a fragment rerun reusing it won't resend.
+        prompt = pending_prompts.pop(agent_type, None)
+        auto_sent = prompt is not None
+        
+        # Show which message is being sent; drawn inside the fragment so its next rerun clears it
+        if auto_sent:
+            st.info(f"🚀 **Sending to both agents:** '{prompt}'" if prompt else "🚀 **Sending empty message to both agents**")
+            st.markdown("*This message will be automatically sent to both agents for comparison*")
         
         # Chat container
         chat_container = st.container()
         
+        # Display chat messages
         with chat_container:
-            for message in st.session_state[messages_key]:
-                with st.chat_message(message["role"]):
+            for role, content in zip(st.session_state[roles_key], st.session_state[contents_key]):
+                with st.chat_message(role):
                     # Display empty messages clearly
-                    content = message["content"] if message["content"] else "(empty message)"
-                    st.markdown(content)
+                    st.markdown(content if content else "(empty message)")
         
         # Check if max messages reached
-        if len(st.session_state[messages_key]) >= st.session_state[max_messages_key]:
+        if len(st.session_state[roles_key]) >= st.session_state[max_messages_key]:
             st.info("💬 Maximum message limit reached for this agent!")
         else:
-            # Check for auto-send message
-            prompt = None
-            if 'auto_send_message' in st.session_state:
-                if f"auto_sent_{agent_type}" not in st.session_state:
-                    prompt = st.session_state.auto_send_message
-                    st.session_state[f"auto_sent_{agent_type}"] = True
-                    
-                    # Clean up after both agents have received the message
-                    if all(f"auto_sent_{a}" in st.session_state for a in ['buggy', 'improved']):
-                        del st.session_state.auto_send_message
-                        if 'showing_auto_message' in st.session_state:
-                            del st.session_state.showing_auto_message
-                        for key in list(st.session_state.keys()):
-                            if key.startswith("auto_sent_"):
-                                del st.session_state[key]
-            
             # Regular chat input (only if no auto-send message)
             if prompt is None:
-                prompt = st.chat_input(f"Try to break the {agent_type} agent!", key=f"{agent_type}_input")
+                prompt = st.chat_input(input_placeholder, key=input_key)
             
             # Handle empty message case
             if prompt is not None:  # This includes empty strings from auto-send
                 # Add user message (show as "(empty message)" if empty)
                 display_prompt = prompt if prompt else "(empty message)"
-                st.session_state[messages_key].append({"role": "user", "content": prompt})
+                append_message(agent_type, "user", prompt)
                 
                 # Prepare messages for API call
-                api_messages = [{"role": "system", "content": system_prompt}]
-                api_messages.extend([
-                    {"role": m["role"], "content": m["content"]}
-                    for m in st.session_state[messages_key]
-                ])
+                # Only the most recent turns are sent, so prompt size stays bounded as the chat grows
+                api_messages = [{"role": "system", "content": system_prompt}] + [
+                    {"role": role, "content": content}
+                    for role, content in zip(
+                        st.session_state[roles_key][-HISTORY_WINDOW:],
+                        st.session_state[contents_key][-HISTORY_WINDOW:],
+                    )
+                ]
                 
                 # Display user message
                 with st.chat_message("user"):
                     st.markdown(display_prompt)
                 
-                # Get AI response
+                # Reserve the assistant slot now so the layout is stable while both agents stream
                 with st.chat_message("assistant"):
-                    try:
-                        with st.spinner("Thinking..."):
-                            stream = client.chat.completions.create(
-                                model="gpt-3.5-turbo",
-                                messages=api_messages,
-                                stream=True,
-                                temperature=0.7 if agent_type == 'buggy' else 0.3,
-                                max_tokens=300
-                            )
-                            response = st.write_stream(stream)
-                            
-                        st.session_state[messages_key].append(
-                            {"role": "assistant", "content": response}
-                        )
-                    except Exception as e:
-                        st.session_state[max_messages_key] = len(st.session_state[messages_key])
-                        rate_limit_message = f"Sorry, I can't respond right now. Too many people are using this demo!"
-                        st.error(rate_limit_message)
-                        st.session_state[messages_key].append(
-                            {"role": "assistant", "content": rate_limit_message}
-                        )
-                        st.rerun()
+                    placeholder = st.empty()
+                    placeholder.markdown("*Thinking...*")
+                
+                pending = {
+                    "agent_type": agent_type,
+                    "messages": api_messages,
+                    "temperature": temperature,
+                    "max_tokens": max_tokens,
+                    "placeholder": placeholder,
+                    # First-turn challenge inputs are identical for everyone, so their replies are cached
+                    "cacheable": prompt in CHALLENGE_INPUTS and len(st.session_state[roles_key]) == 1,
+                }
+                
+        # Message count lives in the fragment so it stays current on fragment-only reruns;
+        # run_agents refreshes it once the reply lands
+        stats = st.empty()
+        show_message_count(stats, agent_type)
+        if pending is not None:
+            pending["stats"] = stats
+            
+            # Typed messages only concern this agent, so stream them here within the fragment rerun;
+            # auto-sent ones are handed back so both agents stream side by side
+            if not auto_sent:
+                run_agents([pending])
+                pending = None
+        
+        # Clear chat button; clearing is rare, so refresh the whole page
+        if st.button(clear_label, key=clear_key):
+            st.session_state[roles_key] = ()
+            st.session_state[contents_key] = ()
+            st.session_state[max_messages_key] = 20
+            st.rerun(scope="app")
         
-        # Clear chat button
-        if st.button(f"🗑️ Clear {agent_type.title()} Chat", key=f"clear_{agent_type}"):
-            st.session_state[messages_key] = []
-            st.session_state[f"{agent_type}_max_messages"] = 20
-            st.rerun()
+        return pending
+    
+    return _run
+
+run_buggy_ui = make_agent_ui(
+    'buggy', BUGGY_SYSTEM_PROMPT, TEMPERATURES['buggy'], MAX_TOKENS['buggy'],
+    "### 🐛 Buggy Agent (Before Debugging)",
+    "*Poorly designed with weak prompting*",
+)
+run_improved_ui = make_agent_ui(
+    'improved', IMPROVED_SYSTEM_PROMPT, TEMPERATURES['improved'], MAX_TOKENS['improved'],
+    "### ✅ Improved Agent (After Debugging)",
+    "*Properly debugged with error handling*",
+)
+
+async def stream_agent(agent_type, api_messages, temperature, max_tokens, events):
+    """Stream one agent's completion, pushing text deltas onto the events queue"""
+    try:
+        stream = await client.chat.completions.create(
+            model=MODEL,
+            messages=api_messages,
+            stream=True,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                events.put((agent_type, chunk.choices[0].delta.content))
+    except Exception as e:
+        events.put((agent_type, e))
+    else:
+        events.put((agent_type, None))
+
+# Live replies to first-turn challenge inputs, shared across sessions: key -> (stored_at, reply)
+@st.cache_resource
+def get_reply_cache():
+    return {}
+
+@st.cache_data(show_spinner=False)
+def read_warm_responses(mtime):
+    """Parse the warm replies file; mtime is only part of the cache key, so a rewritten file is reloaded"""
+    try:
+        with open(WARM_RESPONSES_PATH) as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {
+        (e["system_prompt"], e["prompt"], e["temperature"], e["max_tokens"]): e["content"]
+        for e in entries
+    }
+
+def load_warm_responses():
+    """Pre-generated challenge replies keyed by (system_prompt, prompt, temperature, max_tokens)"""
+    try:
+        mtime = os.path.getmtime(WARM_RESPONSES_PATH)
+    except OSError:
+        # Not generated yet (the batch can take up to 24h); check again on the next lookup
+        return {}
+    return read_warm_responses(mtime)
+
+def challenge_key(request):
+    """Cache key for a first-turn challenge request: (system_prompt, prompt, temperature, max_tokens)"""
+    return (
+        request["messages"][0]["content"], request["messages"][-1]["content"],
+        request["temperature"], request["max_tokens"],
+    )
 
-# Create both chat interfaces
-create_chat_interface('buggy', BUGGY_SYSTEM_PROMPT, left_col)
-create_chat_interface('improved', IMPROVED_SYSTEM_PROMPT, right_col)
+def cached_challenge_reply(key):
+    """Look up a warmed or previously streamed challenge reply, without calling the API"""
+    warm = load_warm_responses().get(key)
+    if warm is not None:
+        return warm
+    entry = get_reply_cache().get(key)
+    if entry is not None and time.monotonic() - entry[0] < REPLY_CACHE_TTL:
+        return entry[1]
+    return None
+
+async def stream_agents(requests, events):
+    await asyncio.gather(*(
+        stream_agent(r["agent_type"], r["messages"], r["temperature"], r["max_tokens"], events)
+        for r in requests
+    ))
+
+def run_agents(requests):
+    """Stream all pending agents concurrently and render their replies as they arrive"""
+    events = queue.Queue()
+    # Cache hits are resolved here; everything else, including cache misses, streams on the loop
+    cached = {
+        r["agent_type"]: reply
+        for r in requests
+        if r["cacheable"] and (reply := cached_challenge_reply(challenge_key(r))) is not None
+    }
+    streamed = [r for r in requests if r["agent_type"] not in cached]
+    future = asyncio.run_coroutine_threadsafe(stream_agents(streamed, events), get_event_loop())
+    by_agent = {r["agent_type"]: r for r in requests}
+    chunks = {agent_type: [] for agent_type in by_agent}
+    unflushed = dict.fromkeys(by_agent, 0)
+    last_flush = dict.fromkeys(by_agent, time.monotonic())
+    
+    try:
+        # Cached replies go through the same queue as streamed ones, arriving as a single delta
+        for agent_type, reply in cached.items():
+            events.put((agent_type, reply))
+            events.put((agent_type, None))
+        
+        while by_agent:
+            agent_type, event = events.get()
+            placeholder = by_agent[agent_type]["placeholder"]
+            
+            if event is None:
+                response = "".join(chunks[agent_type])
+                placeholder.markdown(response)
+                append_message(agent_type, "assistant", response)
+                show_message_count(by_agent[agent_type]["stats"], agent_type)
+                if by_agent[agent_type]["cacheable"] and agent_type not in cached:
+                    get_reply_cache()[challenge_key(by_agent[agent_type])] = (time.monotonic(), response)
+                del by_agent[agent_type]
+            elif isinstance(event, Exception):
+                st.session_state[f"{agent_type}_max_messages"] = len(st.session_state[f"{agent_type}_roles"])
+                rate_limit_message = f"Sorry, I can't respond right now. Too many people are using this demo!"
+                placeholder.error(rate_limit_message)
+                append_message(agent_type, "assistant", rate_limit_message)
+                show_message_count(by_agent[agent_type]["stats"], agent_type)
+                del by_agent[agent_type]
+            else:
+                chunks[agent_type].append(event)
+                unflushed[agent_type] += 1
+                now = time.monotonic()
+                if unflushed[agent_type] >= FLUSH_CHUNKS or now - last_flush[agent_type] >= FLUSH_INTERVAL:
+                    placeholder.markdown("".join(chunks[agent_type]) + "▌")
+                    unflushed[agent_type] = 0
+                    last_flush[agent_type] = now
+    finally:
+        future.cancel()
+
+# Create both chat interfaces, then stream any pending replies side by side
+with left_col:
+    buggy_request = run_buggy_ui(st.session_state.pending_prompts)
+with right_col:
+    improved_request = run_improved_ui(st.session_state.pending_prompts)
+pending_requests = [r for r in (buggy_request, improved_request) if r is not None]
+if pending_requests:
+    run_agents(pending_requests)
 
 # Add debugging insights at the bottom
 st.markdown("---")
@@ -233,16 +404,3 @@ st.markdown("""
 
 **💡 The Goal**: Your AI doesn't need to handle every possible input perfectly, but it should fail gracefully and help users get back on track!
 """)
-
-# Optional: Add some stats
-if st.session_state.get('buggy_messages') or st.session_state.get('improved_messages'):
-    st.markdown("---")
-    st.markdown("### 📊 Demo Stats")
-    buggy_count = len(st.session_state.get('buggy_messages', []))
-    improved_count = len(st.session_state.get('improved_messages', []))
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric("Buggy Agent Messages", buggy_count, delta=None)
-    with col2:
-        st.metric("Improved Agent Messages", improved_count, delta=None)
@@ -0,0 +1,101 @@
+"""Pre-generate replies to the challenge inputs through the OpenAI Batch API.
+
+Run at deploy time (``python warm_cache.py``). Batch requests are billed at half
+the real-time price; the app serves the results from warm_responses.json and
+only falls back to a live call for challenge inputs that are missing there.
+"""
+import json
+import os
+import time
+from openai import OpenAI
+from dotenv import load_dotenv
+from prompts import (
+    MODEL, MAX_TOKENS, TEMPERATURES, BUGGY_SYSTEM_PROMPT, IMPROVED_SYSTEM_PROMPT, CHALLENGE_INPUTS,
+    WARM_RESPONSES_PATH,
+)
+
+POLL_INTERVAL = 30  # seconds between batch status checks
+
+SYSTEM_PROMPTS = {
+    'buggy': BUGGY_SYSTEM_PROMPT,
+    'improved': IMPROVED_SYSTEM_PROMPT,
+}
+
+def build_requests():
+    """One chat completion request per (agent, challenge input) pair"""
+    requests = {}
+    for agent_type, system_prompt in SYSTEM_PROMPTS.items():
+        for i, prompt in enumerate(CHALLENGE_INPUTS):
+            requests[f"{agent_type}-{i}"] = {
+                "system_prompt": system_prompt,
+                "prompt": prompt,
+                "temperature": TEMPERATURES[agent_type],
+                "max_tokens": MAX_TOKENS[agent_type],
+            }
+    return requests
+
+def submit_batch(client, requests):
+    """Upload the requests as a JSONL file and start a batch over them"""
+    lines = [
+        json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": MODEL,
+                "messages": [
+                    {"role": "system", "content": r["system_prompt"]},
+                    {"role": "user", "content": r["prompt"]},
+                ],
+                "temperature": r["temperature"],
+                "max_tokens": r["max_tokens"],
+            },
+        })
+        for custom_id, r in requests.items()
+    ]
+    batch_file = client.files.create(
+        file=("challenge_inputs.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    return client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+
+def wait_for_batch(client, batch):
+    """Poll until the batch reaches a terminal status"""
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        print(f"Batch {batch.id} is {batch.status}, checking again in {POLL_INTERVAL}s...")
+        time.sleep(POLL_INTERVAL)
+        batch = client.batches.retrieve(batch.id)
+    return batch
+
+def main():
+    load_dotenv(override=True)
+    client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+    requests = build_requests()
+    
+    batch = wait_for_batch(client, submit_batch(client, requests))
+    if batch.status != "completed" or not batch.output_file_id:
+        raise SystemExit(f"Batch {batch.id} finished with status '{batch.status}'")
+    
+    entries = []
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        result = json.loads(line)
+        response = result.get("response") or {}
+        if response.get("status_code") != 200:
+            print(f"Skipping {result['custom_id']}: request failed")
+            continue
+        content = response["body"]["choices"][0]["message"]["content"] or ""
+        entries.append({**requests[result["custom_id"]], "content": content})
+    
+    # Write then rename, so a running app never reads a half-written file
+    tmp_path = WARM_RESPONSES_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(entries, f, indent=2)
+    os.replace(tmp_path, WARM_RESPONSES_PATH)
+    print(f"Wrote {len(entries)} of {len(requests)} replies to {WARM_RESPONSES_PATH}")
+
+if __name__ == "__main__":
+    main()